@@ -8,7 +8,6 @@ from pathlib import Path
 # Add parent directory to path to import from src
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.musicxml import MusicXML
 from src.abc_notation import ABCNotation
 
 
@@ -84,6 +83,7 @@ Examples:
         if input_format == 'abc':
             score = ABCNotation.read(args.input)
         else:
+            from src.musicxml import MusicXML
             score = MusicXML.read(args.input)
 
         if args.verbose:
@@ -94,6 +94,7 @@ Examples:
         if output_format == 'abc':
             ABCNotation.write(score, args.output, key=args.key)
         else:
+            from src.musicxml import MusicXML
             MusicXML.write(score, args.output)
 
         print(f"✓ Successfully converted {args.input} to {args.output}")
@@ -9,7 +9,6 @@ from pathlib import Path
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from src.abc_notation import ABCNotation
-from src.musicxml import MusicXML
 from src.transformations import transpose
 
 
@@ -33,6 +32,7 @@ def read_score(filepath: str):
     if format_type == 'abc':
         return ABCNotation.read(filepath)
     elif format_type == 'musicxml':
+        from src.musicxml import MusicXML
         return MusicXML.read(filepath)
 
 
@@ -45,6 +45,7 @@ def write_score(score, filepath: str, key: str = None):
             key = 'C'
         ABCNotation.write(score, filepath, key=key)
     elif format_type == 'musicxml':
+        from src.musicxml import MusicXML
         MusicXML.write(score, filepath)
 
 
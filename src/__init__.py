@@ -1,7 +1,6 @@
 """Musiz - Music notation conversion and transformation library."""
 
 from src.abc_notation import ABCNotation
-from src.musicxml import MusicXML
 from src.data_classes import Note, Measure, Part, Score
 from src.transformations import transpose, MusicTransformer
 
@@ -15,3 +14,11 @@ __all__ = [
     'transpose',
     'MusicTransformer',
 ]
+
+
+def __getattr__(name):
+    # MusicXML pulls in the XML libraries, so load it only when it is used
+    if name == 'MusicXML':
+        from src.musicxml import MusicXML
+        return MusicXML
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -1,44 +1,93 @@
+import os
 import re
+from bisect import bisect_right
+from collections import OrderedDict
+from functools import lru_cache
+
 from src.data_classes import Note, Measure, Part, Score
 
 
 class ABCNotation:
     """Read and write ABC notation files."""
 
-    # ABC note duration mapping (relative to L: unit)
-    NOTE_PATTERN = re.compile(r"([_=^]?)([A-Ga-g],*'*)(\d*/?(\d*))")
+    # Groups: accidental, letter with octave marks, duration.
+    # Possessive quantifiers keep the engine from ever backtracking into a token.
+    NOTE_PATTERN = re.compile(r"([_=^]?+)([A-Ga-g],*+'*+)(\d*+/?+\d*+)")
+
+    # First K: line (any line starting with K that holds a colon, after any
+    # leading whitespace that str.strip() would remove)
+    KEY_FIELD_PATTERN = re.compile(r"^[^\S\n]*K[^:\n]*:.*$", re.MULTILINE)
+
+    # L: unit length ("1/8") and Q: tempo ("1/4=108", BPM captured)
+    FRACTION_PATTERN = re.compile(r"\s*\+?(\d+)\s*/\s*\+?(\d+)\s*")
+    TEMPO_PATTERN = re.compile(r"[^=]*=\s*\+?(\d+)\s*")
+
+    # ABC note duration mapping (relative to L: unit) for the common suffixes
+    DURATION_MULTIPLIERS = {
+        "": 1.0, "/": 0.5, "/2": 0.5, "/4": 0.25,
+        "2": 2.0, "3": 3.0, "4": 4.0, "3/2": 1.5,
+    }
+
+    # Note type for each duration band (relative to a whole note); a duration
+    # at or above NOTE_TYPE_THRESHOLDS[i] maps to NOTE_TYPES[i + 1]
+    NOTE_TYPE_THRESHOLDS = (0.125, 0.25, 0.5, 1.0)
+    NOTE_TYPES = ("16th", "eighth", "quarter", "half", "whole")
+
+    # ABC suffix for the common durations (in divisions, quarter note = 2)
+    DURATION_SUFFIXES = {
+        2: "",      # quarter
+        1: "/",     # eighth
+        4: "2",     # half
+        3: "3/2",   # dotted quarter
+        8: "4",     # whole
+        6: "3",     # dotted half
+    }
+
+    # Most files read_shared keeps parsed at once; the least recently used is dropped
+    READ_CACHE_SIZE = 32
+
+    # Parsed scores for read_shared in LRU order:
+    # absolute path -> ((mtime_ns, size), score)
+    _read_cache: OrderedDict[str, tuple[tuple[int, int], Score]] = OrderedDict()
 
     @staticmethod
     def read(filepath: str) -> Score:
         """Parse an ABC file and return a Score object."""
         with open(filepath, 'r') as f:
-            lines = f.readlines()
+            text = f.read()
 
         score = Score()
 
+        # K: field marks end of header; split there instead of tracking state per line
+        key_field = ABCNotation.KEY_FIELD_PATTERN.search(text)
+        if key_field:
+            header, body = text[:key_field.end()], text[key_field.end():]
+        else:
+            header, body = text, ''
+
         # Parse header fields
         metadata = {}
         music_lines = []
-        in_header = True
 
-        for line in lines:
+        for line in header.split('\n'):
             line = line.strip()
             if not line or line.startswith('%'):  # Skip empty lines and comments
                 continue
 
             # Header field (X:, T:, C:, M:, L:, K:)
-            if ':' in line and in_header:
+            if ':' in line:
                 field_type = line[0]
                 field_value = line[2:].strip()
                 metadata[field_type] = field_value
-
-                # K: field marks end of header
-                if field_type == 'K':
-                    in_header = False
             else:
                 # Music notation
                 music_lines.append(line)
 
+        for line in body.split('\n'):
+            line = line.strip()
+            if line and not line.startswith('%'):
+                music_lines.append(line)
+
         # Set score metadata
         score.title = metadata.get('T')
         score.composer = metadata.get('C')
@@ -61,24 +110,44 @@ class ABCNotation:
             measures_text = line.split('|')
 
             for measure_text in measures_text:
-                measure_text = measure_text.strip()
-                if not measure_text:
-                    continue
-
-                measure = Measure(number=measure_num)
-
-                # Parse notes in the measure
+                # Parse notes in the measure (surrounding whitespace is
+                # skipped by the note scan, so no strip is needed)
                 notes = ABCNotation._parse_notes(measure_text, unit_length)
-                for note in notes:
-                    measure.add_note(note)
 
-                if measure.notes:  # Only add non-empty measures
-                    part.add_measure(measure)
+                if notes:  # Only add non-empty measures
+                    part.add_measure(Measure(number=measure_num, notes=notes))
                     measure_num += 1
 
         score.add_part(part)
         return score
 
+    @staticmethod
+    def read_shared(filepath: str) -> Score:
+        """
+        Parse an ABC file, reusing the Score from an earlier call while the
+        file is unchanged (same modification time and size).
+
+        The returned Score is shared between callers and must be treated as
+        read-only; use read() to get a Score you can modify. At most
+        READ_CACHE_SIZE files are kept, dropping the least recently used.
+        """
+        path = os.path.abspath(filepath)
+        stat = os.stat(path)
+        version = (stat.st_mtime_ns, stat.st_size)
+
+        cache = ABCNotation._read_cache
+        cached = cache.get(path)
+        if cached is not None and cached[0] == version:
+            cache.move_to_end(path)
+            return cached[1]
+
+        score = ABCNotation.read(path)
+        cache[path] = (version, score)
+        cache.move_to_end(path)
+        if len(cache) > ABCNotation.READ_CACHE_SIZE:
+            cache.popitem(last=False)
+        return score
+
     @staticmethod
     def write(score: Score, filepath: str, key: str = "C") -> None:
         """
@@ -89,182 +158,108 @@ class ABCNotation:
             filepath: Output file path
             key: Musical key (e.g., "C", "D", "Dm", "G")
         """
-        lines = []
-
-        # Header fields
-        lines.append("X:1")
-        if score.title:
-            lines.append(f"T:{score.title}")
-        if score.composer:
-            lines.append(f"C:{score.composer}")
-        lines.append("M:4/4")
-        lines.append("L:1/4")
-        if score.tempo:
-            lines.append(f"Q:1/4={score.tempo}")
-        lines.append(f"K:{key}")
-
-        # Music notation
-        if score.parts:
-            part = score.parts[0]  # Take first part
-
-            measure_count = 0
-            music_line = []
-
-            for measure in part.measures:
-                # Convert notes to ABC notation
-                note_strs = []
-                for note in measure.notes:
-                    note_str = ABCNotation._note_to_abc(note)
-                    if note_str:
-                        note_strs.append(note_str)
-
-                if note_strs:
-                    music_line.append(" ".join(note_strs))
-                    measure_count += 1
-
-                    # Add bar line and newline every 4 measures
-                    if measure_count % 4 == 0:
-                        lines.append(" | ".join(music_line) + " |")
-                        music_line = []
-
-            # Add remaining measures
-            if music_line:
-                lines.append(" | ".join(music_line) + " ||")
-
-        # Write to file
-        with open(filepath, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines) + '\n')
+        # Stream straight to the file rather than building the whole text first
+        with open(filepath, 'w', encoding='utf-8', buffering=1 << 16) as f:
+            write = f.write
+
+            # Header fields
+            write("X:1\n")
+            if score.title:
+                write(f"T:{score.title}\n")
+            if score.composer:
+                write(f"C:{score.composer}\n")
+            write("M:4/4\n")
+            write("L:1/4\n")
+            if score.tempo:
+                write(f"Q:1/4={score.tempo}\n")
+            write(f"K:{key}\n")
+
+            # Music notation
+            if score.parts:
+                part = score.parts[0]  # Take first part
+
+                measure_count = 0
+                music_line = []
+
+                for measure in part.measures:
+                    # Convert notes to ABC notation
+                    note_strs = []
+                    for note in measure.notes:
+                        note_str = ABCNotation._note_to_abc(note)
+                        if note_str:
+                            note_strs.append(note_str)
+
+                    if note_strs:
+                        music_line.append(" ".join(note_strs))
+                        measure_count += 1
+
+                        # Add bar line and newline every 4 measures
+                        if measure_count % 4 == 0:
+                            write(" | ".join(music_line) + " |\n")
+                            music_line = []
+
+                # Add remaining measures
+                if music_line:
+                    write(" | ".join(music_line) + " ||\n")
 
     @staticmethod
     def _parse_unit_length(length_str: str) -> float:
         """Parse unit length like '1/8' to float (0.125)."""
-        if '/' in length_str:
-            num, denom = length_str.split('/')
-            return int(num) / int(denom)
+        match = ABCNotation.FRACTION_PATTERN.fullmatch(length_str)
+        if match:
+            return int(match[1]) / int(match[2])
         return float(length_str)
 
     @staticmethod
     def _parse_tempo(tempo_str: str) -> int:
         """Parse tempo like '1/4=108' to BPM value (108)."""
         # Format: note_value=bpm (e.g., "1/4=108")
-        if '=' in tempo_str:
-            parts = tempo_str.split('=')
-            if len(parts) == 2:
-                try:
-                    return int(parts[1].strip())
-                except ValueError:
-                    pass
+        match = ABCNotation.TEMPO_PATTERN.fullmatch(tempo_str)
+        if match:
+            return int(match[1])
         return 120  # default tempo
 
     @staticmethod
     def _parse_notes(measure_text: str, unit_length: float) -> list[Note]:
         """Parse notes from a measure text."""
-        notes = []
-
-        # Remove extra whitespace
-        measure_text = measure_text.strip()
-
-        i = 0
-        while i < len(measure_text):
-            char = measure_text[i]
-
-            # Skip whitespace
-            if char.isspace():
-                i += 1
-                continue
-
-            # Parse note
-            if char in 'ABCDEFGabcdefg_=^':
-                note_str, length = ABCNotation._extract_note(measure_text[i:])
-                i += length
-
-                if note_str:
-                    note = ABCNotation._parse_single_note(note_str, unit_length)
-                    if note:
-                        notes.append(note)
-            else:
-                i += 1
-
-        return notes
+        # Scan the whole measure in one pass; anything between matches
+        # (whitespace, rests, decorations) is skipped by the regex engine
+        return [
+            ABCNotation._parse_single_note(match, unit_length)
+            for match in ABCNotation.NOTE_PATTERN.finditer(measure_text)
+        ]
 
     @staticmethod
-    def _extract_note(text: str) -> tuple[str, int]:
-        """Extract a single note string and its length in characters."""
-        match = ABCNotation.NOTE_PATTERN.match(text)
-        if match:
-            return match.group(0), len(match.group(0))
-
-        # Simple fallback for basic notes
-        length = 1
-        # Check for duration number
-        if length < len(text) and text[length].isdigit():
-            while length < len(text) and (text[length].isdigit() or text[length] == '/'):
-                length += 1
-
-        return text[:length], length
+    def _parse_single_note(match: re.Match, unit_length: float) -> Note:
+        """Parse a NOTE_PATTERN match into a Note object."""
+        # accidental (group 1: ^, _, =) is captured but not handled yet
+        step, octave, duration, note_type = ABCNotation._note_fields(match[2], match[3], unit_length)
+        return Note(step, octave, duration, note_type)
 
     @staticmethod
-    def _parse_single_note(note_str: str, unit_length: float) -> Note | None:
-        """Parse a single ABC note string into a Note object."""
-        # Handle accidentals (^, _, =)
-        idx = 0
-        if note_str[0] in '^_=':
-            # accidental = note_str[0]  # TODO: Handle accidentals in future
-            idx = 1
-
-        # Get note letter
-        if idx >= len(note_str):
-            return None
-
-        note_letter = note_str[idx]
-        idx += 1
-
+    @lru_cache(maxsize=1024)
+    def _note_fields(pitch: str, duration_str: str, unit_length: float) -> tuple[str, int, int, str]:
+        """
+        Work out (step, octave, duration, note_type) for a pitch and duration token.
+        Cached since a tune repeats the same few tokens throughout.
+        """
         # Determine octave from case and octave markers (, and ')
         # Lowercase = octave 5, uppercase = octave 4
         # Each , lowers octave, each ' raises octave
+        note_letter = pitch[0]
         if note_letter.islower():
             octave = 5
             step = note_letter.upper()
         else:
             octave = 4
             step = note_letter
-
-        # Handle octave modifiers
-        while idx < len(note_str) and note_str[idx] in ",'":
-            if note_str[idx] == ',':
-                octave -= 1
-            elif note_str[idx] == "'":
-                octave += 1
-            idx += 1
+        if len(pitch) > 1:
+            octave += pitch.count("'") - pitch.count(",")
 
         # Parse duration (default is 1 unit)
-        duration_multiplier = 1.0
-
-        if idx < len(note_str):
-            duration_str = note_str[idx:]
-
-            if duration_str == '':
-                duration_multiplier = 1.0
-            elif duration_str[0] == '/':
-                # /2 means half, /4 means quarter, / alone means /2
-                if len(duration_str) == 1:
-                    duration_multiplier = 0.5
-                else:
-                    try:
-                        duration_multiplier = 1.0 / int(duration_str[1:])
-                    except ValueError:
-                        duration_multiplier = 0.5
-            elif duration_str[0].isdigit():
-                # 2 means double, 3 means triple, etc.
-                try:
-                    # Handle cases like "3/2"
-                    if '/' in duration_str:
-                        num, denom = duration_str.split('/')
-                        duration_multiplier = int(num) / int(denom)
-                    else:
-                        duration_multiplier = int(duration_str)
-                except ValueError:
-                    duration_multiplier = 1.0
+        duration_multiplier = ABCNotation.DURATION_MULTIPLIERS.get(duration_str)
+        if duration_multiplier is None:
+            duration_multiplier = ABCNotation._parse_duration(duration_str)
 
         # Calculate actual duration
         actual_duration = unit_length * duration_multiplier
@@ -276,43 +271,51 @@ class ABCNotation:
         # This handles dotted notes and divisions better
         duration_divisions = round(actual_duration * 8)
 
-        return Note(
-            step=step,
-            octave=octave,
-            duration=duration_divisions,
-            note_type=note_type,
-            is_rest=False
-        )
+        return step, octave, duration_divisions, note_type
+
+    @staticmethod
+    def _parse_duration(duration_str: str) -> float:
+        """Parse an ABC duration suffix like '3/4' or '/8' to a unit multiplier."""
+        if duration_str[0] == '/':
+            # /2 means half, /4 means quarter, / alone means /2
+            try:
+                return 1.0 / int(duration_str[1:])
+            except ValueError:
+                return 0.5
+
+        # 2 means double, 3 means triple, etc.
+        try:
+            # Handle cases like "3/2"
+            if '/' in duration_str:
+                num, denom = duration_str.split('/')
+                return int(num) / int(denom)
+            return int(duration_str)
+        except ValueError:
+            return 1.0
 
     @staticmethod
     def _duration_to_type(duration: float) -> str:
         """Convert duration to note type."""
-        if duration >= 1.0:
-            return "whole"
-        elif duration >= 0.5:
-            return "half"
-        elif duration >= 0.25:
-            return "quarter"
-        elif duration >= 0.125:
-            return "eighth"
-        else:
-            return "16th"
+        return ABCNotation.NOTE_TYPES[bisect_right(ABCNotation.NOTE_TYPE_THRESHOLDS, duration)]
 
     @staticmethod
     def _note_to_abc(note: Note) -> str:
         """Convert a Note object to ABC notation."""
-        if note.is_rest:
-            return ABCNotation._duration_to_abc_suffix(note.duration)
+        return ABCNotation._pitch_to_abc(note.step, note.octave or 4, note.duration, note.is_rest)
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _pitch_to_abc(step: str | None, octave: int, duration: int, is_rest: bool) -> str:
+        """Convert note fields to ABC notation."""
+        if is_rest:
+            return ABCNotation._duration_to_abc_suffix(duration)
 
-        if not note.step:
+        if not step:
             return ""
 
         # Convert note letter and octave to ABC notation
         # Octave 4 = uppercase, octave 5 = lowercase
         # ABC notation: C,, C, C c c' c''
-        step = note.step
-        octave = note.octave or 4
-
         if octave == 4:
             abc_note = step.upper()
         elif octave == 5:
@@ -327,7 +330,7 @@ class ABCNotation:
             abc_note = step.upper()
 
         # Add duration suffix
-        duration_suffix = ABCNotation._duration_to_abc_suffix(note.duration)
+        duration_suffix = ABCNotation._duration_to_abc_suffix(duration)
 
         return abc_note + duration_suffix
 
@@ -337,28 +340,11 @@ class ABCNotation:
         Convert duration (in divisions) to ABC duration suffix.
         With divisions=2, quarter note = 2, eighth = 1, half = 4, etc.
         """
-        # Map duration to ABC suffix
-        # quarter note (2) = no suffix
-        # eighth (1) = /
-        # half (4) = 2
-        # dotted quarter (3) = 3/2
-        # whole (8) = 4
-
-        if duration == 2:  # quarter
-            return ""
-        elif duration == 1:  # eighth
-            return "/"
-        elif duration == 4:  # half
-            return "2"
-        elif duration == 3:  # dotted quarter
-            return "3/2"
-        elif duration == 8:  # whole
-            return "4"
-        elif duration == 6:  # dotted half
-            return "3"
-        else:
-            # Generic handling
-            if duration < 2:
-                return f"/{int(2/duration)}"
-            else:
-                return str(int(duration / 2))
+        suffix = ABCNotation.DURATION_SUFFIXES.get(duration)
+        if suffix is not None:
+            return suffix
+
+        # Generic handling
+        if duration < 2:
+            return f"/{int(2/duration)}"
+        return str(int(duration / 2))
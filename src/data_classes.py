@@ -2,7 +2,7 @@ from dataclasses import dataclass, field
 from typing import Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class Note:
     """Represents a musical note in MusicXML."""
     step: Optional[str] = None  # C, D, E, F, G, A, B
@@ -22,7 +22,7 @@ class Note:
         return f"Note({self.step}{self.octave}, duration={self.duration}, type={self.note_type})"
 
 
-@dataclass
+@dataclass(slots=True)
 class Measure:
     """Represents a musical measure containing notes."""
     number: int
@@ -36,7 +36,7 @@ class Measure:
         self.notes.append(note)
 
 
-@dataclass
+@dataclass(slots=True)
 class Part:
     """Represents a musical part containing measures."""
     part_id: str
@@ -50,7 +50,7 @@ class Part:
         self.measures.append(measure)
 
 
-@dataclass
+@dataclass(slots=True)
 class Score:
     """Represents a complete musical score with metadata and parts."""
     title: Optional[str] = None
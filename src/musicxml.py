@@ -1,5 +1,7 @@
+import sys
 import xml.etree.ElementTree as ET
-from xml.dom import minidom
+from functools import lru_cache
+from xml.sax.saxutils import escape
 
 from src.data_classes import Note, Measure, Part, Score
 
@@ -7,125 +9,179 @@ from src.data_classes import Note, Measure, Part, Score
 class MusicXML:
     """Read and write MusicXML files."""
 
+    # Attributes written to the first measure: 2 divisions per quarter note,
+    # C major / A minor, 4/4 time, treble clef
+    FIRST_MEASURE_ATTRIBUTES = (
+        "      <attributes>\n"
+        "        <divisions>2</divisions>\n"
+        "        <key>\n"
+        "          <fifths>0</fifths>\n"
+        "        </key>\n"
+        "        <time>\n"
+        "          <beats>4</beats>\n"
+        "          <beat-type>4</beat-type>\n"
+        "        </time>\n"
+        "        <clef>\n"
+        "          <sign>G</sign>\n"
+        "          <line>2</line>\n"
+        "        </clef>\n"
+        "      </attributes>\n"
+    )
+
+    # Durations (with divisions=2) written with a <dot/>: dotted quarter, half, whole
+    DOTTED_DURATIONS = frozenset({3, 6, 12})
+
+    # Extra entities for attribute values (escape() covers &, < and >)
+    ATTRIBUTE_ENTITIES = {'"': "&quot;", "\n": "&#10;", "\r": "&#13;", "\t": "&#09;"}
+
+    # Tempo direction for the first measure, filled in with str.format
+    TEMPO_DIRECTION = (
+        '      <direction placement="above">\n'
+        "        <direction-type>\n"
+        '          <metronome parentheses="no">\n'
+        "            <beat-unit>quarter</beat-unit>\n"
+        "            <per-minute>{tempo}</per-minute>\n"
+        "          </metronome>\n"
+        "        </direction-type>\n"
+        '        <sound tempo="{tempo}" />\n'
+        "      </direction>\n"
+    )
+
     @staticmethod
     def read(filepath: str) -> Score:
         """Parse a MusicXML file and return a Score object."""
-        tree = ET.parse(filepath)
-        root = tree.getroot()
-
         score = Score()
-
-        # Parse metadata
-        work = root.find("work")
-        if work is not None:
-            work_title = work.find("work-title")
-            if work_title is not None:
-                score.title = work_title.text
-
-        # Parse credits for title, subtitle, and composer
-        for credit in root.findall("credit"):
-            credit_type_elem = credit.find("credit-type")
-            credit_words_elem = credit.find("credit-words")
-
-            if credit_type_elem is not None and credit_words_elem is not None:
-                credit_type = credit_type_elem.text
-                credit_text = credit_words_elem.text
-
-                if credit_type == "title":
-                    score.title = credit_text
-                elif credit_type == "subtitle":
-                    score.subtitle = credit_text
-                elif credit_type == "composer":
-                    score.composer = credit_text
-
-        # Get part list to find part names
         part_names = {}
-        part_list = root.find("part-list")
-        if part_list is not None:
-            for score_part in part_list.findall("score-part"):
-                part_id = score_part.get("id")
-                part_name_elem = score_part.find("part-name")
-                if part_name_elem is not None:
-                    part_names[part_id] = part_name_elem.text
-
-        # Parse all parts
-        for part_elem in root.findall("part"):
-            part_id = part_elem.get("id")
-            if not part_id:
+        part = None
+        depth = 0
+
+        # Stream the document: each top-level element (and each measure
+        # inside a part) is handled as soon as it closes and then cleared,
+        # so only the measure being read is held in memory
+        for event, elem in ET.iterparse(filepath, events=("start", "end")):
+            if event == "start":
+                depth += 1
+                if depth == 2 and elem.tag == "part":
+                    part_id = elem.get("id")
+                    part = Part(part_id=part_id, name=part_names.get(part_id)) if part_id else None
                 continue
-            part = Part(part_id=part_id, name=part_names.get(part_id))
-
-            # Parse all measures
-            for measure_elem in part_elem.findall("measure"):
-                measure_number_str = measure_elem.get("number")
-                if not measure_number_str:
-                    continue
-                measure_number = int(measure_number_str)
-                measure_width = measure_elem.get("width")
-                measure = Measure(
-                    number=measure_number,
-                    width=float(measure_width) if measure_width else None
-                )
 
-                # Parse all notes in the measure
-                for note_elem in measure_elem.findall("note"):
-                    note = MusicXML._parse_note(note_elem)
-                    measure.add_note(note)
+            if depth == 3 and elem.tag == "measure":
+                if part is not None:
+                    measure = MusicXML._parse_measure(elem)
+                    if measure is not None:
+                        part.add_measure(measure)
+                elem.clear()
+
+            elif depth == 2:
+                tag = elem.tag
+                if tag == "work":
+                    # Parse metadata
+                    work_title = elem.find("work-title")
+                    if work_title is not None:
+                        score.title = work_title.text
+
+                elif tag == "credit":
+                    # Parse credits for title, subtitle, and composer
+                    MusicXML._parse_credit(elem, score)
+
+                elif tag == "part-list":
+                    # Get part list to find part names
+                    for score_part in elem.findall("score-part"):
+                        part_id = score_part.get("id")
+                        part_name_elem = score_part.find("part-name")
+                        if part_name_elem is not None:
+                            part_name = part_name_elem.text
+                            part_names[part_id] = sys.intern(part_name) if part_name else part_name
+
+                elif tag == "part" and part is not None:
+                    score.add_part(part)
+                    part = None
+
+                elem.clear()
+
+            depth -= 1
 
-                part.add_measure(measure)
+        return score
 
-            score.add_part(part)
+    @staticmethod
+    def _parse_credit(credit_elem: ET.Element, score: Score) -> None:
+        """Apply a credit element's title, subtitle or composer to the score."""
+        credit_type_elem = credit_elem.find("credit-type")
+        credit_words_elem = credit_elem.find("credit-words")
+
+        if credit_type_elem is not None and credit_words_elem is not None:
+            credit_type = credit_type_elem.text
+            credit_text = credit_words_elem.text
+
+            if credit_type == "title":
+                score.title = credit_text
+            elif credit_type == "subtitle":
+                score.subtitle = credit_text
+            elif credit_type == "composer":
+                score.composer = credit_text
 
-        return score
+    @staticmethod
+    def _parse_measure(measure_elem: ET.Element) -> Measure | None:
+        """Parse a measure element into a Measure, or None if it has no number."""
+        measure_number_str = measure_elem.get("number")
+        if not measure_number_str:
+            return None
+        measure_number = int(measure_number_str)
+        measure_width = measure_elem.get("width")
+
+        # Parse all notes in the measure straight into its note list
+        return Measure(
+            number=measure_number,
+            notes=list(map(MusicXML._parse_note, measure_elem.findall("note"))),
+            width=float(measure_width) if measure_width else None
+        )
 
     @staticmethod
     def _parse_note(note_elem: ET.Element) -> Note:
         """Parse a note element into a Note object."""
-        # Check if it's a rest
-        is_rest = note_elem.find("rest") is not None
-
-        # Get pitch information
         step = None
         octave = None
-        if not is_rest:
-            pitch_elem = note_elem.find("pitch")
-            if pitch_elem is not None:
-                step_elem = pitch_elem.find("step")
-                octave_elem = pitch_elem.find("octave")
-                if step_elem is not None and step_elem.text:
-                    step = step_elem.text
-                if octave_elem is not None and octave_elem.text:
-                    octave = int(octave_elem.text)
-
-        # Get duration
         duration = 0
-        duration_elem = note_elem.find("duration")
-        if duration_elem is not None and duration_elem.text:
-            duration = int(duration_elem.text)
-
-        # Get note type (quarter, half, etc.)
         note_type = None
-        type_elem = note_elem.find("type")
-        if type_elem is not None:
-            note_type = type_elem.text
-
-        # Get voice
         voice = None
-        voice_elem = note_elem.find("voice")
-        if voice_elem is not None:
-            voice = voice_elem.text
-
-        # Get staff
         staff = None
-        staff_elem = note_elem.find("staff")
-        if staff_elem is not None and staff_elem.text:
-            staff = int(staff_elem.text)
-
-        # Get stem
         stem = None
-        stem_elem = note_elem.find("stem")
-        if stem_elem is not None:
-            stem = stem_elem.text
+        is_rest = False
+
+        # Walk the children once, dispatching on tag, instead of a find() per field.
+        # Repeated strings (step, type, voice, stem) are interned so every note
+        # shares one object per value rather than holding its own copy.
+        for child in note_elem:
+            tag = child.tag
+            text = child.text
+            if tag == "pitch":
+                for pitch_child in child:
+                    pitch_text = pitch_child.text
+                    if pitch_child.tag == "step" and pitch_text:
+                        step = sys.intern(pitch_text)
+                    elif pitch_child.tag == "octave" and pitch_text:
+                        octave = int(pitch_text)
+            elif tag == "duration":
+                if text:
+                    duration = int(text)
+            elif tag == "type":
+                # quarter, half, etc.
+                note_type = sys.intern(text) if text else text
+            elif tag == "voice":
+                voice = sys.intern(text) if text else text
+            elif tag == "staff":
+                if text:
+                    staff = int(text)
+            elif tag == "stem":
+                stem = sys.intern(text) if text else text
+            elif tag == "rest":
+                is_rest = True
+
+        # Rests carry no pitch
+        if is_rest:
+            step = None
+            octave = None
 
         # Get position
         default_x = note_elem.get("default-x")
@@ -147,123 +203,108 @@ class MusicXML:
     @staticmethod
     def write(score: Score, filepath: str) -> None:
         """Write a Score object to a MusicXML file."""
-        # Create root element
-        root = ET.Element("score-partwise", version="4.0")
-
-        # Add work element
-        if score.title:
-            work = ET.SubElement(root, "work")
-            work_title = ET.SubElement(work, "work-title")
-            work_title.text = score.title
-
-        # Add identification
-        identification = ET.SubElement(root, "identification")
-        if score.composer:
-            creator = ET.SubElement(identification, "creator", type="composer")
-            creator.text = score.composer
-
-        # Add part-list
-        part_list = ET.SubElement(root, "part-list")
-        for part in score.parts:
-            score_part = ET.SubElement(part_list, "score-part", id=part.part_id)
-            part_name = ET.SubElement(score_part, "part-name")
-            part_name.text = part.name or "Music"
-
-        # Add parts
-        for part in score.parts:
-            part_elem = ET.SubElement(root, "part", id=part.part_id)
-
-            for measure in part.measures:
-                measure_elem = ET.SubElement(part_elem, "measure", number=str(measure.number))
-
-                # Add attributes to first measure
-                if measure.number == 1:
-                    attributes = ET.SubElement(measure_elem, "attributes")
-                    divisions = ET.SubElement(attributes, "divisions")
-                    divisions.text = "2"  # 2 divisions per quarter note
-
-                    key = ET.SubElement(attributes, "key")
-                    fifths = ET.SubElement(key, "fifths")
-                    fifths.text = "0"
-
-                    time = ET.SubElement(attributes, "time")
-                    beats = ET.SubElement(time, "beats")
-                    beats.text = "4"
-                    beat_type = ET.SubElement(time, "beat-type")
-                    beat_type.text = "4"
-
-                    clef = ET.SubElement(attributes, "clef")
-                    sign = ET.SubElement(clef, "sign")
-                    sign.text = "G"
-                    line = ET.SubElement(clef, "line")
-                    line.text = "2"
-
-                    # Add tempo directive to first measure
-                    if score.tempo:
-                        direction = ET.SubElement(measure_elem, "direction", placement="above")
-                        direction_type = ET.SubElement(direction, "direction-type")
-                        metronome = ET.SubElement(direction_type, "metronome", parentheses="no")
-                        beat_unit = ET.SubElement(metronome, "beat-unit")
-                        beat_unit.text = "quarter"
-                        per_minute = ET.SubElement(metronome, "per-minute")
-                        per_minute.text = str(score.tempo)
-                        sound = ET.SubElement(direction, "sound")
-                        sound.set("tempo", str(score.tempo))
-
-                # Add notes
-                for note in measure.notes:
-                    MusicXML._write_note(measure_elem, note)
-
-        # Create tree and write to file with pretty formatting
-        xml_str = ET.tostring(root, encoding='unicode')
-
-        # Pretty print
-        dom = minidom.parseString(xml_str)
-        pretty_xml = dom.toprettyxml(indent="  ")
-
-        # Remove extra blank lines
-        lines = [line for line in pretty_xml.split('\n') if line.strip()]
-
+        # Serialize straight to the file rather than building an element tree
         with open(filepath, 'w', encoding='utf-8') as f:
-            f.write('\n'.join(lines))
+            write = f.write
+            write("<?xml version='1.0' encoding='utf-8'?>\n")
+            write('<score-partwise version="4.0">\n')
+
+            # Add work element
+            if score.title:
+                write(f"  <work>\n    <work-title>{escape(score.title)}</work-title>\n  </work>\n")
+
+            # Add identification
+            if score.composer:
+                write("  <identification>\n")
+                write(f'    <creator type="composer">{escape(score.composer)}</creator>\n')
+                write("  </identification>\n")
+            else:
+                write("  <identification />\n")
+
+            # Add part-list
+            write("  <part-list>\n")
+            for part in score.parts:
+                write(f'    <score-part id="{escape(part.part_id, MusicXML.ATTRIBUTE_ENTITIES)}">\n')
+                write(f"      <part-name>{escape(part.name or 'Music')}</part-name>\n")
+                write("    </score-part>\n")
+            write("  </part-list>\n")
+
+            # Add parts
+            measure_xml = MusicXML._measure_xml
+            for part in score.parts:
+                write(f'  <part id="{escape(part.part_id, MusicXML.ATTRIBUTE_ENTITIES)}">\n')
+
+                # One serialized chunk per measure
+                for measure in part.measures:
+                    write(measure_xml(measure, score.tempo))
+
+                write("  </part>\n")
+
+            write("</score-partwise>")
 
     @staticmethod
-    def _write_note(measure_elem: ET.Element, note: Note) -> None:
-        """Write a Note object to XML."""
-        note_elem = ET.SubElement(measure_elem, "note")
+    def _measure_xml(measure: Measure, tempo: int | None) -> str:
+        """Serialize a Measure object, with its notes, to an indented <measure> element."""
+        chunks = [f'    <measure number="{measure.number}">\n']
+
+        # Add attributes to first measure
+        if measure.number == 1:
+            chunks.append(MusicXML.FIRST_MEASURE_ATTRIBUTES)
+
+            # Add tempo directive to first measure
+            if tempo:
+                chunks.append(MusicXML.TEMPO_DIRECTION.format(tempo=tempo))
 
-        if note.is_rest:
-            ET.SubElement(note_elem, "rest")
+        # Add notes
+        chunks.extend(map(MusicXML._note_xml, measure.notes))
+
+        chunks.append("    </measure>\n")
+        return "".join(chunks)
+
+    @staticmethod
+    def _note_xml(note: Note) -> str:
+        """Serialize a Note object to an indented <note> element."""
+        return MusicXML._note_fields_xml(
+            note.step, note.octave, note.duration, note.note_type, note.voice, note.is_rest
+        )
+
+    @staticmethod
+    @lru_cache(maxsize=1024)
+    def _note_fields_xml(
+        step: str | None,
+        octave: int | None,
+        duration: int,
+        note_type: str | None,
+        voice: str | None,
+        is_rest: bool
+    ) -> str:
+        """Serialize the written note fields to an indented <note> element."""
+        if is_rest:
+            pitch = "        <rest />\n"
         else:
             # Add pitch
-            pitch = ET.SubElement(note_elem, "pitch")
-            step = ET.SubElement(pitch, "step")
-            step.text = note.step
-            octave = ET.SubElement(pitch, "octave")
-            octave.text = str(note.octave)
-
-        # Add duration
-        duration = ET.SubElement(note_elem, "duration")
-        duration.text = str(note.duration)
+            pitch = (
+                "        <pitch>\n"
+                f"          <step>{escape(step or '')}</step>\n"
+                f"          <octave>{octave}</octave>\n"
+                "        </pitch>\n"
+            )
 
         # Add type
-        if note.note_type:
-            type_elem = ET.SubElement(note_elem, "type")
-            type_elem.text = note.note_type
+        type_xml = f"        <type>{escape(note_type)}</type>\n" if note_type else ""
 
         # Add dot for dotted notes (duration that's 1.5x the base note)
-        # Check if duration suggests a dotted note
-        if note.duration == 3:  # dotted quarter (with divisions=2)
-            ET.SubElement(note_elem, "dot")
-        elif note.duration == 6:  # dotted half (with divisions=2)
-            ET.SubElement(note_elem, "dot")
-        elif note.duration == 12:  # dotted whole (with divisions=2)
-            ET.SubElement(note_elem, "dot")
+        dot = "        <dot />\n" if duration in MusicXML.DOTTED_DURATIONS else ""
 
         # Add voice
-        if note.voice:
-            voice = ET.SubElement(note_elem, "voice")
-            voice.text = note.voice
-        else:
-            voice = ET.SubElement(note_elem, "voice")
-            voice.text = "1"
+        voice = escape(voice) if voice else "1"
+
+        return (
+            "      <note>\n"
+            f"{pitch}"
+            f"        <duration>{duration}</duration>\n"
+            f"{type_xml}"
+            f"{dot}"
+            f"        <voice>{voice}</voice>\n"
+            "      </note>\n"
+        )
@@ -1,6 +1,15 @@
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from itertools import repeat
+
 from src.data_classes import Score, Part, Measure, Note
 
 
+def _gil_enabled() -> bool:
+    """Return whether the GIL is enabled (False only on free-threaded builds)."""
+    return sys._is_gil_enabled()
+
+
 class MusicTransformer:
     """Music transformation utilities."""
 
@@ -12,6 +21,13 @@ class MusicTransformer:
         'C': 0, 'D': 2, 'E': 4, 'F': 5, 'G': 7, 'A': 9, 'B': 11
     }
 
+    # Step name for each semitone above C (sharps collapse onto the natural below)
+    SEMITONE_TO_STEP = "CCDDEFFGGAAB"
+
+    # Fewest notes across all parts before transpose uses a thread pool;
+    # starting one costs about as much as transposing 80 notes
+    PARALLEL_MIN_NOTES = 10_000
+
     @staticmethod
     def transpose(score: Score, semitones: int) -> Score:
         """
@@ -24,42 +40,69 @@ class MusicTransformer:
         Returns:
             A new transposed Score object
         """
+        # Every note with the same step moves the same way, so resolve the
+        # pitch arithmetic once per step instead of once per note
+        pitch_table = MusicTransformer._pitch_table(semitones)
+        transpose_part = MusicTransformer._transpose_part
+
+        # Parts are independent, so spread them over threads when the
+        # interpreter can actually run them in parallel (free-threaded build)
+        # and there is enough work to pay for the pool
+        if (
+            len(score.parts) > 1
+            and not _gil_enabled()
+            and sum(len(measure.notes) for part in score.parts for measure in part.measures)
+            >= MusicTransformer.PARALLEL_MIN_NOTES
+        ):
+            with ThreadPoolExecutor() as executor:
+                transposed_parts = list(executor.map(transpose_part, score.parts, repeat(pitch_table)))
+        else:
+            transposed_parts = [transpose_part(part, pitch_table) for part in score.parts]
+
         # Create a new score with copied metadata
-        transposed_score = Score(
+        return Score(
             title=score.title,
             subtitle=score.subtitle,
             composer=score.composer,
-            tempo=score.tempo
+            tempo=score.tempo,
+            parts=transposed_parts
         )
 
-        # Transpose each part
-        for part in score.parts:
-            transposed_part = Part(
-                part_id=part.part_id,
-                name=part.name
-            )
-
-            # Transpose each measure
-            for measure in part.measures:
-                transposed_measure = Measure(
+    @staticmethod
+    def _transpose_part(part: Part, pitch_table: dict[str, tuple[str, int]]) -> Part:
+        """Transpose every measure of a part."""
+        transpose_notes = MusicTransformer._transpose_notes
+        return Part(
+            part_id=part.part_id,
+            name=part.name,
+            measures=[
+                Measure(
                     number=measure.number,
+                    notes=transpose_notes(measure.notes, pitch_table),
                     width=measure.width
                 )
+                for measure in part.measures
+            ]
+        )
 
-                # Transpose each note
-                for note in measure.notes:
-                    transposed_note = MusicTransformer._transpose_note(note, semitones)
-                    transposed_measure.add_note(transposed_note)
-
-                transposed_part.add_measure(transposed_measure)
-
-            transposed_score.add_part(transposed_part)
+    @staticmethod
+    def _pitch_table(semitones: int) -> dict[str, tuple[str, int]]:
+        """Map each step to its transposed step and octave shift."""
+        pitch_table = {}
+        for step, interval in MusicTransformer.SEMITONE_INTERVALS.items():
+            octave_shift, new_semitone = divmod(interval + semitones, 12)
+            pitch_table[step] = (MusicTransformer.SEMITONE_TO_STEP[new_semitone], octave_shift)
+        return pitch_table
 
-        return transposed_score
+    @staticmethod
+    def _transpose_notes(notes: list[Note], pitch_table: dict[str, tuple[str, int]]) -> list[Note]:
+        """Transpose a measure's notes in one batch."""
+        transpose_note = MusicTransformer._transpose_note
+        return [transpose_note(note, pitch_table) for note in notes]
 
     @staticmethod
-    def _transpose_note(note: Note, semitones: int) -> Note:
-        """Transpose a single note by semitones."""
+    def _transpose_note(note: Note, pitch_table: dict[str, tuple[str, int]]) -> Note:
+        """Transpose a single note using a table from _pitch_table."""
         # If it's a rest, just copy it
         if note.is_rest:
             return Note(
@@ -80,29 +123,11 @@ class MusicTransformer:
             # Return as-is if no step defined
             return note
 
-        # Calculate new position
-        current_octave = note.octave or 4
-
-        # Transpose by semitones
-        # Convert to absolute semitone position
-        absolute_position = current_octave * 12 + MusicTransformer.SEMITONE_INTERVALS[note.step]
-        new_position = absolute_position + semitones
-
-        # Convert back to note + octave
-        new_octave = new_position // 12
-        new_semitone = new_position % 12
-
-        # Find the closest note in the scale
-        # Map semitone back to note name
-        semitone_to_note = {
-            0: 'C', 1: 'C', 2: 'D', 3: 'D', 4: 'E', 5: 'F',
-            6: 'F', 7: 'G', 8: 'G', 9: 'A', 10: 'A', 11: 'B'
-        }
-        new_step = semitone_to_note[new_semitone]
+        new_step, octave_shift = pitch_table[note.step]
 
         return Note(
             step=new_step,
-            octave=new_octave,
+            octave=(note.octave or 4) + octave_shift,
             duration=note.duration,
             note_type=note.note_type,
             voice=note.voice,
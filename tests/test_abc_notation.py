@@ -0,0 +1,106 @@
+import os
+from collections import OrderedDict
+
+import pytest
+
+from src.abc_notation import ABCNotation
+
+
+def test_read_shared_reuses_parsed_score():
+    """Test that repeated shared reads of an unchanged file return the cached score."""
+    first = ABCNotation.read_shared("ode_to_joy.abc")
+    second = ABCNotation.read_shared("ode_to_joy.abc")
+
+    assert first is second
+    assert first == ABCNotation.read("ode_to_joy.abc")
+
+
+def test_read_shared_reparses_changed_file(tmp_path):
+    """Test that a shared read picks up changes to the file."""
+    path = tmp_path / "tune.abc"
+    path.write_text("X:1\nT:First\nL:1/4\nK:C\nC D E F |\n")
+    first = ABCNotation.read_shared(str(path))
+
+    path.write_text("X:1\nT:Second\nL:1/4\nK:C\nG A B c |\n")
+    stat = os.stat(path)
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    second = ABCNotation.read_shared(str(path))
+
+    assert first is not second
+    assert second.title == "Second"
+    assert second.parts[0].measures[0].notes[0].step == "G"
+
+
+def test_read_shared_evicts_least_recently_used(tmp_path, monkeypatch):
+    """Test that the shared read cache drops the least recently used file when full."""
+    monkeypatch.setattr(ABCNotation, "READ_CACHE_SIZE", 2)
+    monkeypatch.setattr(ABCNotation, "_read_cache", OrderedDict())
+    paths = []
+    for name in ("a", "b", "c"):
+        path = tmp_path / f"{name}.abc"
+        path.write_text("X:1\nK:C\nC D |\n")
+        paths.append(str(path))
+
+    first = ABCNotation.read_shared(paths[0])
+    second = ABCNotation.read_shared(paths[1])
+    assert ABCNotation.read_shared(paths[0]) is first
+    ABCNotation.read_shared(paths[2])
+
+    assert ABCNotation.read_shared(paths[0]) is first
+    assert ABCNotation.read_shared(paths[1]) is not second
+
+
+@pytest.mark.parametrize("length_field, tempo_field, unit_length, tempo", [
+    ("L:1/8", "Q:1/4=108", 0.125, 108),
+    ("L: 1 / 8", "Q:1/4 = 96", 0.125, 96),
+    ("L:1/ 4", "Q:1/4=+80", 0.25, 80),
+    ("L:+1/8", "Q:1/4=108", 0.125, 108),
+    ("L:1/+8", "Q:1/4=108", 0.125, 108),
+    ("L:1/8", "Q:108", 0.125, 120),
+])
+def test_read_unit_length_and_tempo(tmp_path, length_field, tempo_field, unit_length, tempo):
+    """Test that L: and Q: header values tolerate spacing and fall back to defaults."""
+    path = tmp_path / "tune.abc"
+    path.write_text(f"X:1\n{length_field}\n{tempo_field}\nK:C\nC |\n")
+
+    score = ABCNotation.read(str(path))
+
+    assert score.tempo == tempo
+    assert score.parts[0].measures[0].notes[0].duration == round(unit_length * 8)
+
+
+@pytest.mark.parametrize("text, expected", [
+    # No K: field: every line is header, colon-free lines are music
+    ("X:1\nL:1/4\nC D |\nE F |\n", [[("C", 2), ("D", 2)], [("E", 2), ("F", 2)]]),
+    # Music line without a colon before K:
+    ("X:1\nT:Tune\nC D |\nK:C\nE F |\n", [[("C", 1), ("D", 1)], [("E", 1), ("F", 1)]]),
+    # Indented K: still ends the header, so the later L: is not a field
+    ("X:1\nL:1/4\n  K:C\nC |\nL:1/2\n", [[("C", 2)]]),
+    # Any non-newline whitespace may indent K:, as str.strip() would remove it
+    ("X:1\n\fK:G\nL:1/2\nC|", [[("C", 1)]]),
+    # Only \n ends a line; a form feed stays inside the measure
+    ("X:1\nK:C\nC D\x0cE F | G\n", [[("C", 1), ("D", 1), ("E", 1), ("F", 1)], [("G", 1)]]),
+])
+def test_read_header_body_split(tmp_path, text, expected):
+    """Test that the header ends at the K: field and music lines are kept."""
+    path = tmp_path / "tune.abc"
+    path.write_text(text)
+
+    score = ABCNotation.read(str(path))
+
+    measures = [[(note.step, note.duration) for note in measure.notes]
+                for measure in score.parts[0].measures]
+    assert measures == expected
+
+
+@pytest.mark.parametrize("music", ["^4 C|", "^45 C|", "_167/0 C|"])
+def test_read_skips_accidental_without_letter(tmp_path, music):
+    """Test that an accidental followed by digits instead of a note letter is skipped."""
+    path = tmp_path / "tune.abc"
+    path.write_text(f"X:1\nK:C\n{music}\n")
+
+    score = ABCNotation.read(str(path))
+
+    measures = [[(note.step, note.duration) for note in measure.notes]
+                for measure in score.parts[0].measures]
+    assert measures == [[("C", 1)]]
@@ -0,0 +1,46 @@
+from src.abc_notation import ABCNotation
+from src.data_classes import Note, Measure, Part, Score
+from src.musicxml import MusicXML
+
+
+def test_round_trip_preserves_notes(tmp_path):
+    """Test that writing and reading back MusicXML keeps every note."""
+    original = ABCNotation.read("ode_to_joy.abc")
+    path = tmp_path / "ode_to_joy.musicxml"
+
+    MusicXML.write(original, str(path))
+    restored = MusicXML.read(str(path))
+
+    assert restored.title == original.title
+    assert len(restored.parts[0].measures) == len(original.parts[0].measures)
+    for orig_measure, read_measure in zip(original.parts[0].measures, restored.parts[0].measures):
+        assert orig_measure.number == read_measure.number
+        assert [(n.step, n.octave, n.duration, n.note_type) for n in orig_measure.notes] == [
+            (n.step, n.octave, n.duration, n.note_type) for n in read_measure.notes
+        ]
+
+
+def test_read_multiple_parts(tmp_path):
+    """Test that parts keep their names, order and measures."""
+    score = Score(
+        title="Duet",
+        parts=[
+            Part(part_id="P1", name="Flute", measures=[
+                Measure(number=1, notes=[Note(step="E", octave=5, duration=8, note_type="whole")])
+            ]),
+            Part(part_id="P2", name="Cello", measures=[
+                Measure(number=1, notes=[Note(step="C", octave=3, duration=4, note_type="half"),
+                                         Note(duration=4, note_type="half", is_rest=True)])
+            ]),
+        ]
+    )
+    path = tmp_path / "duet.musicxml"
+
+    MusicXML.write(score, str(path))
+    restored = MusicXML.read(str(path))
+
+    assert [(part.part_id, part.name) for part in restored.parts] == [("P1", "Flute"), ("P2", "Cello")]
+    cello_notes = restored.parts[1].measures[0].notes
+    assert (cello_notes[0].step, cello_notes[0].octave) == ("C", 3)
+    assert cello_notes[1].is_rest
+    assert cello_notes[1].voice == "1"
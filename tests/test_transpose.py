@@ -1,9 +1,11 @@
 import pytest
+from src import transformations
 from src.abc_notation import ABCNotation
-from src.transformations import transpose
+from src.data_classes import Note, Measure, Part, Score
+from src.transformations import MusicTransformer, transpose
 
 
-@pytest.fixture
+@pytest.fixture(scope="module")
 def original_score():
     """Load the original ode_to_joy.abc score."""
     return ABCNotation.read("ode_to_joy.abc")
@@ -72,10 +74,8 @@ def test_transpose_preserves_duration(original_score):
         original_score.parts[0].measures,
         transposed.parts[0].measures
     ):
-        assert len(orig_measure.notes) == len(trans_measure.notes)
-        for orig_note, trans_note in zip(orig_measure.notes, trans_measure.notes):
-            assert orig_note.duration == trans_note.duration
-            assert orig_note.note_type == trans_note.note_type
+        assert [note.duration for note in orig_measure.notes] == [note.duration for note in trans_measure.notes]
+        assert [note.note_type for note in orig_measure.notes] == [note.note_type for note in trans_measure.notes]
 
 
 def test_transpose_octave_change(original_score):
@@ -88,3 +88,41 @@ def test_transpose_octave_change(original_score):
 
     assert first_note.step == original_first_note.step
     assert first_note.octave == original_first_note.octave + 1
+
+
+@pytest.mark.parametrize("gil_enabled", [True, False])
+def test_transpose_multiple_parts(original_score, monkeypatch, gil_enabled):
+    """Test that every part is transposed and part order is kept, serially or threaded."""
+    monkeypatch.setattr(transformations, "_gil_enabled", lambda: gil_enabled)
+    monkeypatch.setattr(MusicTransformer, "PARALLEL_MIN_NOTES", 0)
+    melody = original_score.parts[0]
+    score = Score(
+        title=original_score.title,
+        parts=[
+            Part(part_id="P1", name="Melody", measures=melody.measures),
+            Part(part_id="P2", name="Bass", measures=[
+                Measure(number=1, notes=[Note(step="D", octave=3, duration=8, note_type="whole")])
+            ]),
+        ]
+    )
+
+    transposed = transpose(score, 2)
+
+    assert [part.part_id for part in transposed.parts] == ["P1", "P2"]
+    assert transposed.parts[0].measures[0].notes[0].step == "G"
+    bass_note = transposed.parts[1].measures[0].notes[0]
+    assert (bass_note.step, bass_note.octave, bass_note.duration) == ("E", 3, 8)
+
+
+def test_transpose_small_score_stays_serial(original_score, monkeypatch):
+    """Test that a multi-part score below the note threshold skips the thread pool."""
+    def no_pool():
+        raise AssertionError("thread pool used for a small score")
+
+    monkeypatch.setattr(transformations, "_gil_enabled", lambda: False)
+    monkeypatch.setattr(transformations, "ThreadPoolExecutor", no_pool)
+    score = Score(parts=[original_score.parts[0], original_score.parts[0]])
+
+    transposed = transpose(score, 2)
+
+    assert [part.measures[0].notes[0].step for part in transposed.parts] == ["G", "G"]